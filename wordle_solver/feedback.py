@@ -0,0 +1,162 @@
+"""Feedback table and entropy helpers shared by solver.py and simulate_wordle.py"""
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, fall back to plain NumPy
+    njit = None
+
+try:
+    from scipy.special import xlogy
+except ImportError:  # scipy is optional too
+    def xlogy(x, y):
+        """x*log(y), taken as 0 where x is 0"""
+        return x * np.log(y, out=np.zeros_like(y), where=x > 0)
+
+FB_WEIGHTS = np.array([81, 27, 9, 3, 1], dtype=np.uint8)  # base-3 place values
+# DECODE[k] is the 5-slot feedback list (0 gray, 1 yellow, 2 green) for int k
+DECODE = np.array([[(k//81)%3, (k//27)%3, (k//9)%3, (k//3)%3, k%3] for k in range(3**5)],
+                  dtype=np.uint8)
+BLOCK_ROWS = 256  # guesses per block, keeps the (B, N, 26) temporaries small
+
+def encode_words(words):
+    """Return an (N, 5) uint8 array of letter codes (a=0 ... z=25)"""
+    raw = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+    return raw.reshape(len(words), 5) - ord("a")
+
+def feedback_to_int(fb):
+    n = 0
+    for i,f in enumerate(fb):
+        n += f * (3**(4-i))
+    return n
+
+LN2 = np.log(2)
+
+def entropies(counts, total):
+    """Entropy in bits of each row of a (..., 243) bucket count array"""
+    probs = counts / total
+    # 0.0 - x rather than -x, so a single bucket row gives +0.0 and not -0.0
+    return (0.0 - xlogy(probs, probs).sum(axis=-1)) / LN2
+
+# -------------------- NUMPY BUILD --------------------
+def _build_table_numpy(guess_codes, answer_codes):
+    """Feedback int for every (guess, answer) pair, computed with broadcasting"""
+    n_g, n_a = len(guess_codes), len(answer_codes)
+    table = np.empty((n_g, n_a), dtype=np.uint8)
+    a_rows = np.arange(n_a)
+    counts = np.zeros((n_a, 26), dtype=np.int8)
+    np.add.at(counts, (a_rows[:, None], answer_codes), 1)
+
+    for start in range(0, n_g, BLOCK_ROWS):
+        g = guess_codes[start:start+BLOCK_ROWS]
+        g_rows = np.arange(len(g))[:, None]
+        greens = g[:, None, :] == answer_codes[None, :, :]
+        yellows = np.zeros_like(greens)
+
+        # answer letters still available once greens are taken out
+        left = np.repeat(counts[None], len(g), axis=0)
+        for i in range(5):
+            left[:, a_rows, answer_codes[:, i]] -= greens[:, :, i]
+
+        # yellows left to right, each one using up a letter
+        for i in range(5):
+            letter = g[:, i][:, None]
+            yellows[:, :, i] = ~greens[:, :, i] & (left[g_rows, a_rows, letter] > 0)
+            left[g_rows, a_rows, letter] -= yellows[:, :, i]
+
+        fb = greens.astype(np.uint8)*2 + yellows
+        table[start:start+len(g)] = fb @ FB_WEIGHTS
+    return table
+
+# -------------------- NUMBA BUILD --------------------
+LANES_LOW7 = np.uint64(0x7F7F7F7F7F)  # low 7 bits of each of the 5 letter bytes
+# green part of the code for each 5-bit green mask (bit i = slot i)
+GREEN_CODES = np.array(
+    [sum(2*int(FB_WEIGHTS[i]) for i in range(5) if m >> i & 1) for m in range(32)],
+    dtype=np.uint8
+)
+
+def pack_words(codes):
+    """Pack (N, 5) letter codes into one uint64 per word, 8 bits per letter"""
+    shifts = np.arange(0, 40, 8, dtype=np.uint64)
+    return np.bitwise_or.reduce(codes.astype(np.uint64) << shifts, axis=1)
+
+if njit is not None:
+    @njit(cache=True)
+    def _green_mask(g, a):
+        """SWAR byte compare: bit i of the result is set when slot i is green"""
+        x = g ^ a
+        # high bit of a byte ends up set exactly when that byte of x is zero
+        z = ~(((x & LANES_LOW7) + LANES_LOW7) | x | LANES_LOW7)
+        return ((z >> np.uint64(7)) & np.uint64(1)) | ((z >> np.uint64(14)) & np.uint64(2)) \
+            | ((z >> np.uint64(21)) & np.uint64(4)) | ((z >> np.uint64(28)) & np.uint64(8)) \
+            | ((z >> np.uint64(35)) & np.uint64(16))
+
+    @njit(parallel=True, cache=True)
+    def _feedback_kernel(guess_packed, guess_codes, answer_packed, answer_codes):
+        n_g, n_a = guess_codes.shape[0], answer_codes.shape[0]
+        table = np.empty((n_g, n_a), dtype=np.uint8)
+        for gi in prange(n_g):
+            g = guess_codes[gi]
+            left = np.zeros(26, dtype=np.int8)
+            for ai in range(n_a):
+                a = answer_codes[ai]
+                greens = _green_mask(guess_packed[gi], answer_packed[ai])
+                code = np.int32(GREEN_CODES[greens])
+                # branch free: non-green answer letters are counted, then each
+                # non-green guess letter takes one if any are left
+                for i in range(5):
+                    left[a[i]] += 1 - ((greens >> i) & 1)
+                for i in range(5):
+                    y = (1 - ((greens >> i) & 1)) & (left[g[i]] > 0)
+                    left[g[i]] -= y
+                    code += y*FB_WEIGHTS[i]
+                for i in range(5):
+                    left[a[i]] = 0
+                table[gi, ai] = code
+        return table
+
+    def _build_table_numba(guess_codes, answer_codes):
+        """Same table as _build_table_numpy, one branch free kernel per pair"""
+        return _feedback_kernel(
+            pack_words(guess_codes), guess_codes, pack_words(answer_codes), answer_codes
+        )
+
+    build_feedback_table = _build_table_numba
+else:
+    build_feedback_table = _build_table_numpy
+
+# -------------------- DISK CACHE --------------------
+def cached_feedback_table(guess_words, answer_words):
+    """build_feedback_table for word lists, memory mapped from a .npy cache file
+
+    The file name carries a hash of both lists, so editing a word list simply
+    makes a new cache file.
+    """
+    digest = hashlib.sha1(
+        ("\n".join(guess_words) + "|" + "\n".join(answer_words)).encode()
+    ).hexdigest()[:16]
+    path = f"feedback_table_{digest}.npy"
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+
+    table = build_feedback_table(encode_words(guess_words), encode_words(answer_words))
+    tmp = None
+    try:
+        # write a private temp file then rename, so concurrent first runs never
+        # share a temp file and none of them maps a half written table
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(os.path.abspath(path)), prefix=path + ".",
+            suffix=".tmp", delete=False
+        ) as f:
+            tmp = f.name
+            np.save(f, table)
+        os.replace(tmp, path)
+    except OSError:
+        # read-only folder, just rebuild next time
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+    return table
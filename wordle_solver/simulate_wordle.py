@@ -1,7 +1,12 @@
 import math
+import multiprocessing
+import os
 import time
 import numpy as np
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from feedback import DECODE, cached_feedback_table, entropies
 
 # -------------------- LOAD WORD LISTS --------------------
 def load_words(filename):
@@ -12,133 +17,191 @@ possible_words = load_words("possible_words.txt")
 allowed_words = possible_words.copy()  # only possible answers
 N_answers = len(possible_words)
 N_feedback = 3**5  # 243 possible feedbacks
+# candidate index dtype, int16 halves the gather traffic of int32
+IDX_DTYPE = np.int16 if N_answers <= np.iinfo(np.int16).max else np.int32
 
-# -------------------- FEEDBACK --------------------
-def get_feedback(guess, answer):
-    fb = [0]*5
-    ans_letters = list(answer)
-    for i in range(5):
-        if guess[i] == answer[i]:
-            fb[i] = 2
-            ans_letters[i] = None
-    for i in range(5):
-        if fb[i]==0 and guess[i] in ans_letters:
-            fb[i] = 1
-            ans_letters[ans_letters.index(guess[i])] = None
-    return fb
-
-def feedback_to_int(fb):
-    n = 0
-    for i,f in enumerate(fb):
-        n += f * (3**(4-i))
-    return n
-
-# -------------------- PRECOMPUTE FEEDBACK TABLE --------------------
-print("Precomputing feedback table for possible answers only...", flush=True)
-t0 = time.time()
-feedback_table = np.zeros((N_answers, N_answers), dtype=np.uint8)
-for gi, g in enumerate(possible_words):
-    for ai, a in enumerate(possible_words):
-        feedback_table[gi, ai] = feedback_to_int(get_feedback(g, a))
-print(f"Feedback table ready in {time.time()-t0:.1f}s\n", flush=True)
+# -------------------- FEEDBACK TABLE --------------------
+# set by use_feedback_table, in the main process and in every worker
+feedback_table = None
+first_buckets = None
+fixed_first_guess_idx = possible_words.index("raise")
+fb_buf = np.empty(N_answers, dtype=np.uint8)  # reused by the filter step
+
+def use_feedback_table(table):
+    global feedback_table, first_buckets
+    feedback_table = table
+    # candidates left after the fixed first guess, one bucket per feedback
+    first_buckets = [np.flatnonzero(table[fixed_first_guess_idx]==fb).astype(IDX_DTYPE)
+                     for fb in range(N_feedback)]
 
 # -------------------- ENTROPY --------------------
+# False ranks guesses by expected remaining candidates (sum of squared bucket
+# sizes) using integer math only; it averages 3.618 guesses vs 3.594 for entropy
+SCORE_BY_ENTROPY = True
+
+def guess_scores(counts, R):
+    if SCORE_BY_ENTROPY:
+        return entropies(counts, R)
+    return -(counts*counts).sum(axis=1)
+
 def best_entropy_guess(remaining_idx):
-    best_g = None
-    best_e = -1
-    for gi in remaining_idx:
-        counts = np.bincount(feedback_table[gi, remaining_idx], minlength=N_feedback)
-        probs = counts[counts>0]/len(remaining_idx)
-        e = np.sum(probs*np.log2(1/probs))
-        if e > best_e:
-            best_e = e
-            best_g = gi
-    return best_g
+    R = len(remaining_idx)
+    sub = feedback_table.take(remaining_idx, axis=0).take(remaining_idx, axis=1)
+    # one histogram row per candidate guess, all in a single bincount
+    flat = sub + N_feedback*np.arange(R)[:, None]
+    counts = np.bincount(flat.ravel(), minlength=N_feedback*R).reshape(R, N_feedback)
+    return remaining_idx[guess_scores(counts, R).argmax()]
+
+# many games reach the same candidate set, so solve each set only once
+best_guess_cache = {}
+
+def cached_best_guess(remaining_idx):
+    key = remaining_idx.tobytes()  # remaining stays sorted, so this is canonical
+    gi = best_guess_cache.get(key)
+    if gi is None:
+        gi = best_entropy_guess(remaining_idx)
+        best_guess_cache[key] = gi
+    return gi
 
 # -------------------- EMOJIS --------------------
 EMOJIS = ["⬛", "🟨", "🟩"]  # gray, yellow, green
+EMOJI_ROWS = ["".join(EMOJIS[val] for val in fb) for fb in DECODE]  # by feedback int
 MAX_GUESSES = 6
 MAX_DISPLAY_GAMES = 3  # show last 3 games
+DISPLAY_EVERY = 20  # redraw the live view once per this many games
 
-def format_game(feedbacks, words):
+def format_game(feedbacks, guess_idx):
     """Return a 5x6 grid of emojis for a single game"""
     lines = []
     for i in range(MAX_GUESSES):
         if i < len(feedbacks):
             fb = feedbacks[i]
         else:
-            fb = [0]*5  # fill remaining rows with gray
-        w = words[i] if i < len(words) else " "*5
-        lines.append("".join([EMOJIS[val] for val in fb]) + "  " + w)
+            fb = 0  # fill remaining rows with gray
+        w = possible_words[guess_idx[i]] if i < len(guess_idx) else " "*5
+        lines.append(EMOJI_ROWS[fb] + "  " + w)
     return lines
 
 # -------------------- SIMULATION --------------------
-results = []
-fixed_first_guess_idx = possible_words.index("raise")
-start_time = time.time()
-prev_lines = 0
-all_game_feedbacks = []
-all_game_words = []
+N_WORKERS = os.cpu_count() or 1
+CHUNK_GAMES = 64  # games handed to a worker at a time
+ALL_IDX = np.arange(N_answers, dtype=IDX_DTYPE)  # read-only, filtering makes new arrays
 
-for ai, answer in enumerate(possible_words):
-    remaining = np.arange(N_answers)
+def simulate_one(ai):
+    """Play one game against answer ai, return (guesses, feedbacks, guess indices)"""
+    remaining = ALL_IDX
     guesses = 0
     game_feedbacks = []
-    game_words = []
+    game_guesses = []
 
     while True:
         guesses += 1
         if guesses == 1:
             gi = fixed_first_guess_idx
         else:
-            gi = best_entropy_guess(remaining)
+            gi = cached_best_guess(remaining)
 
         fb = feedback_table[gi, ai]
-        fb_list = [(fb // 3**(4-i)) % 3 for i in range(5)]
-        game_feedbacks.append(fb_list)
-        game_words.append(possible_words[gi])
+        game_feedbacks.append(int(fb))
+        game_guesses.append(int(gi))
 
         if gi == ai or guesses >= MAX_GUESSES:
             break
 
-        remaining = remaining[feedback_table[gi, remaining]==fb]
-
-    results.append(guesses)
-    all_game_feedbacks.append(game_feedbacks)
-    all_game_words.append(game_words)
-
-    # ------------- LIVE PRINT (last 3 games) ----------------
-    if prev_lines:
-        print(f"\033[{prev_lines}F", end='')  # move cursor up
-
-    display_lines = []
-    for last_games in all_game_feedbacks[-MAX_DISPLAY_GAMES:]:
-        idx = all_game_feedbacks.index(last_games)
-        display_lines.extend(format_game(last_games, all_game_words[idx]))
-        display_lines.append("")  # empty line between games
-
-    # Add progress bar
-    done = ai+1
-    avg = sum(results)/done
-    worst = max(results)
-    bar_len = 30
-    filled = int(bar_len*done/N_answers)
-    bar = "█"*filled + "-"*(bar_len-filled)
-    elapsed = time.time() - start_time
-    eta = elapsed*(N_answers/done-1)
-    prog_line = f"[{bar}] {done}/{N_answers}  Avg: {avg:.3f}  Worst: {worst}  ETA: {eta:5.1f}s"
-    display_lines.append(prog_line)
-
-    for l in display_lines:
-        print(l.ljust(80))
-
-    prev_lines = len(display_lines)
-    time.sleep(0.005)  # tiny delay for visual effect
-
-# -------------------- FINAL RESULTS --------------------
-dist = Counter(results)
-print("\n===== FINAL RESULTS =====")
-print(f"Total games: {len(results)}  Avg: {sum(results)/len(results):.3f}  Worst: {max(results)}")
-print("Distribution:")
-for k in sorted(dist):
-    print(f"{k} guesses: {dist[k]}")
+        if guesses == 1:
+            remaining = first_buckets[fb]
+        else:
+            # indices are always in range; mode="clip" writes straight into fb_buf
+            # where the default mode="raise" would buffer out internally
+            codes = feedback_table[gi].take(remaining, out=fb_buf[:len(remaining)], mode="clip")
+            remaining = remaining.compress(codes==fb)
+
+    return guesses, game_feedbacks, game_guesses
+
+worker_shm = None
+
+def init_worker(shm_name, shape):
+    """Attach a worker to the feedback table in shared memory"""
+    global worker_shm
+    worker_shm = shared_memory.SharedMemory(name=shm_name)
+    use_feedback_table(np.ndarray(shape, dtype=np.uint8, buffer=worker_shm.buf))
+
+def play_all_games(table):
+    """Yield simulate_one results in answer order, spread over N_WORKERS processes"""
+    if N_WORKERS == 1:
+        use_feedback_table(table)
+        yield from map(simulate_one, range(N_answers))
+        return
+
+    shm = shared_memory.SharedMemory(create=True, size=table.nbytes)
+    try:
+        shared = np.ndarray(table.shape, dtype=np.uint8, buffer=shm.buf)
+        shared[:] = table
+        del shared  # no views may outlive shm.close()
+        # spawn, not fork: forking after numba has started its thread pool can hang
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(N_WORKERS, mp_context=ctx, initializer=init_worker,
+                                 initargs=(shm.name, table.shape)) as pool:
+            yield from pool.map(simulate_one, range(N_answers), chunksize=CHUNK_GAMES)
+    finally:
+        shm.close()
+        shm.unlink()
+
+def main():
+    print("Precomputing feedback table for possible answers only...", flush=True)
+    t0 = time.time()
+    table = cached_feedback_table(possible_words, possible_words)
+    print(f"Feedback table ready in {time.time()-t0:.1f}s\n", flush=True)
+
+    results = []
+    start_time = time.time()
+    prev_lines = 0
+    all_game_feedbacks = []
+    all_game_guesses = []
+
+    for guesses, game_feedbacks, game_guesses in play_all_games(table):
+        results.append(guesses)
+        all_game_feedbacks.append(game_feedbacks)
+        all_game_guesses.append(game_guesses)
+
+        # ------------- LIVE PRINT (last 3 games) ----------------
+        done = len(results)
+        if done % DISPLAY_EVERY and done != N_answers:
+            continue
+
+        if prev_lines:
+            print(f"\033[{prev_lines}F", end='')  # move cursor up
+
+        display_lines = []
+        for game_fbs, game_gs in zip(all_game_feedbacks[-MAX_DISPLAY_GAMES:],
+                                     all_game_guesses[-MAX_DISPLAY_GAMES:]):
+            display_lines.extend(format_game(game_fbs, game_gs))
+            display_lines.append("")  # empty line between games
+
+        # Add progress bar
+        avg = sum(results)/done
+        worst = max(results)
+        bar_len = 30
+        filled = int(bar_len*done/N_answers)
+        bar = "█"*filled + "-"*(bar_len-filled)
+        elapsed = time.time() - start_time
+        eta = elapsed*(N_answers/done-1)
+        prog_line = f"[{bar}] {done}/{N_answers}  Avg: {avg:.3f}  Worst: {worst}  ETA: {eta:5.1f}s"
+        display_lines.append(prog_line)
+
+        for l in display_lines:
+            print(l.ljust(80))
+
+        prev_lines = len(display_lines)
+
+    # -------------------- FINAL RESULTS --------------------
+    dist = Counter(results)
+    print("\n===== FINAL RESULTS =====")
+    print(f"Total games: {len(results)}  Avg: {sum(results)/len(results):.3f}  Worst: {max(results)}")
+    print("Distribution:")
+    for k in sorted(dist):
+        print(f"{k} guesses: {dist[k]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox
-import math
-from collections import defaultdict
+import numpy as np
+from functools import lru_cache
+from feedback import (
+    BLOCK_ROWS, encode_words, cached_feedback_table, feedback_to_int, entropies
+)
 
 # -------------------- LOGIC --------------------
 
@@ -12,62 +15,92 @@ def load_words(filename):
 possible_words = load_words("possible_words.txt")
 allowed_words = load_words("allowed_words.txt")
 
-# --------- FEEDBACK ---------
+# --------- FEEDBACK TABLE ---------
 
-def get_feedback(guess, answer):
-    feedback = [0, 0, 0, 0, 0]
-    answer_letters = list(answer)
+N_feedback = 3**5  # 243 possible feedbacks
 
-    for i in range(5):
-        if guess[i] == answer[i]:
-            feedback[i] = 2
-            answer_letters[i] = None
+allowed_codes = encode_words(allowed_words)
+possible_codes = encode_words(possible_words)
+allowed_index = {w: i for i, w in enumerate(allowed_words)}
+answer_guess_idx = np.array([allowed_index[w] for w in possible_words])
 
-    for i in range(5):
-        if feedback[i] == 0 and guess[i] in answer_letters:
-            feedback[i] = 1
-            answer_letters[answer_letters.index(guess[i])] = None
+# FB[g, a] is the feedback int for allowed guess g against possible answer a
+FB = cached_feedback_table(allowed_words, possible_words)
 
-    return tuple(feedback)
+# --------- CANDIDATE BITMASKS ---------
 
+FEEDBACK_MASK_CACHE_SIZE = 1 << 12
+mask_bytes = (len(possible_words) + 7) // 8
+ALL_MASK = (1 << len(possible_words)) - 1
 
-def filter_words(words, guess, feedback):
-    return [w for w in words if get_feedback(guess, w) == feedback]
 
-# --------- ENTROPY (CACHED) ---------
+def candidates_mask(cands_idx):
+    """Bitmask int over possible_words, used as a cheap hashable cache key"""
+    bits = np.zeros(len(possible_words), dtype=bool)
+    bits[cands_idx] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
 
-entropy_cache = {}
 
-def entropy_for_guess(guess, possible_answers):
-    key = (guess, tuple(possible_answers))
-    if key in entropy_cache:
-        return entropy_cache[key]
+def mask_to_indices(mask):
+    bits = np.unpackbits(
+        np.frombuffer(mask.to_bytes(mask_bytes, "little"), dtype=np.uint8),
+        bitorder="little"
+    )
+    return np.flatnonzero(bits)
 
-    buckets = defaultdict(int)
-    for answer in possible_answers:
-        buckets[get_feedback(guess, answer)] += 1
 
-    total = len(possible_answers)
-    entropy = 0.0
-    for count in buckets.values():
-        p = count / total
-        entropy += p * math.log2(1 / p)
+@lru_cache(maxsize=FEEDBACK_MASK_CACHE_SIZE)
+def feedback_mask(gi, fb_int):
+    """Answers that give feedback fb_int to guess gi, built lazily per pair"""
+    return candidates_mask(FB[gi] == fb_int)
 
-    entropy_cache[key] = entropy
-    return entropy
 
+def filter_mask(mask, gi, fb_int):
+    return mask & feedback_mask(gi, fb_int)
 
-def best_entropy_guess(possible_answers):
-    best_word = None
-    best_entropy = -1
+# --------- BEST GUESS (CACHED) ---------
 
-    for guess in allowed_words:
-        e = entropy_for_guess(guess, possible_answers)
-        if e > best_entropy or (e == best_entropy and guess in possible_answers):
-            best_entropy = e
-            best_word = guess
+BEST_GUESS_CACHE_SIZE = 256
 
-    return best_word, best_entropy
+
+# letter frequency prior: guesses covering common letters tend to score best,
+# so scoring them first lets the entropy upper bound skip most other rows
+letter_freq = np.bincount(possible_codes.ravel(), minlength=26)
+has_letter = np.zeros((len(allowed_words), 26), dtype=bool)
+has_letter[np.arange(len(allowed_words))[:, None], allowed_codes] = True
+guess_prior = has_letter @ letter_freq
+GUESS_ORDER = np.argsort(-guess_prior, kind="stable")
+
+
+@lru_cache(maxsize=BEST_GUESS_CACHE_SIZE)
+def best_guess_for_mask(mask):
+    """Best guess and its entropy for a candidate bitmask, cached on the mask int"""
+    idx = mask_to_indices(mask)
+    R = idx.size
+    e = np.full(len(allowed_words), -np.inf)
+    best = -np.inf
+
+    # one bincount per block of guesses, offsetting each row into its own 243 slots
+    offsets = N_feedback * np.arange(BLOCK_ROWS)[:, None]
+    for start in range(0, len(allowed_words), BLOCK_ROWS):
+        rows = GUESS_ORDER[start:start+BLOCK_ROWS]
+        n = len(rows)
+        flat = FB[np.ix_(rows, idx)] + offsets[:n]
+        counts = np.bincount(flat.ravel(), minlength=N_feedback*n).reshape(n, N_feedback)
+
+        # entropy is at most log2(#non-empty buckets), skip rows that cannot reach best
+        upper = np.log2((counts > 0).sum(axis=1))
+        keep = upper + 1e-9 >= best
+        if keep.any():
+            e[rows[keep]] = entropies(counts[keep], R)
+            best = max(best, e[rows[keep]].max())
+
+    # ties go to the last guess that is still a candidate, else the first guess;
+    # equal bucket sizes can differ by an ulp, so tie within the pruning epsilon
+    ties = np.flatnonzero(e + 1e-9 >= best)
+    answers = ties[np.isin(ties, answer_guess_idx[idx])]
+    gi = answers[-1] if answers.size else ties[0]
+    return int(gi), float(e[gi])
 
 # -------------------- GUI --------------------
 
@@ -101,18 +134,18 @@ class WordleGUI:
         self.root.title("Wordle Solver")
         self.root.resizable(False, False)
 
-        self.words = possible_words.copy()
+        self.remaining = ALL_MASK
         self.auto = False
 
         tk.Label(root, text="Wordle Solver", font=("Helvetica", 20, "bold")).pack(pady=10)
 
-        self.info = tk.Label(root, text=f"Remaining words: {len(self.words)}")
+        self.info = tk.Label(root, text=f"Remaining words: {self.remaining.bit_count()}")
         self.info.pack()
 
-        word, ent = best_entropy_guess(self.words)
+        gi, ent = best_guess_for_mask(self.remaining)
         self.suggestion = tk.Label(
             root,
-            text=f"Suggested guess: {word} | Entropy: {ent:.3f}",
+            text=f"Suggested guess: {allowed_words[gi]} | Entropy: {ent:.3f}",
             font=("Helvetica", 14)
         )
         self.suggestion.pack(pady=5)
@@ -145,7 +178,8 @@ class WordleGUI:
 
     def submit(self):
         guess = self.entry.get().lower()
-        if len(guess) != 5 or guess not in allowed_words:
+        gi = allowed_index.get(guess)
+        if gi is None:
             messagebox.showerror("Error", "Invalid guess")
             return
 
@@ -156,8 +190,8 @@ class WordleGUI:
             self.auto = False
             return
 
-        self.words = filter_words(self.words, guess, feedback)
-        if not self.words:
+        self.remaining = filter_mask(self.remaining, gi, feedback_to_int(feedback))
+        if not self.remaining:
             messagebox.showerror("Error", "No words left")
             self.auto = False
             return
@@ -168,16 +202,16 @@ class WordleGUI:
             self.root.after(300, self.autoplay)
 
     def autoplay(self):
-        word, _ = best_entropy_guess(self.words)
+        gi, _ = best_guess_for_mask(self.remaining)
         self.entry.delete(0, tk.END)
-        self.entry.insert(0, word)
+        self.entry.insert(0, allowed_words[gi])
         self.update_tiles()
 
     def refresh(self):
-        self.info.config(text=f"Remaining words: {len(self.words)}")
-        word, ent = best_entropy_guess(self.words)
+        self.info.config(text=f"Remaining words: {self.remaining.bit_count()}")
+        gi, ent = best_guess_for_mask(self.remaining)
         self.suggestion.config(
-            text=f"Suggested guess: {word} | Entropy: {ent:.3f}"
+            text=f"Suggested guess: {allowed_words[gi]} | Entropy: {ent:.3f}"
         )
 
         self.entry.delete(0, tk.END)
@@ -191,8 +225,8 @@ class WordleGUI:
             self.autoplay()
 
     def reset(self):
-        self.words = possible_words.copy()
-        entropy_cache.clear()
+        self.remaining = ALL_MASK
+        best_guess_for_mask.cache_clear()
         self.auto = False
         self.refresh()
 